@@ -1,12 +1,16 @@
 #!/usr/bin/env python3
-import os, json, threading
+import os, time, atexit, threading, uuid
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 from dotenv import load_dotenv
 from flask import (
     Flask, render_template, request, redirect, url_for,
-    jsonify, session, abort, flash
+    jsonify, session, flash, abort
 )
+from flask.json.provider import JSONProvider
+from werkzeug.routing import IntegerConverter, ValidationError
 from yt_runner import (
-    load_accounts, save_accounts, load_status,
+    load_accounts, with_accounts, account_count, load_status, save_status, is_run_active,
     run_account, get_auth_flow_for_account,
     store_credentials_for_account, has_valid_credentials,
     # dashboard helpers
@@ -19,7 +23,25 @@ from yt_runner import (
 # ---------------------------------------------------
 load_dotenv()
 
+class OrjsonProvider(JSONProvider):
+    """jsonify()/request.get_json() backed by orjson."""
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+class AccountIndexConverter(IntegerConverter):
+    """<acctidx:idx>: an index into accounts.json; out-of-range values 404 before the view runs."""
+    def to_python(self, value):
+        idx = super().to_python(value)
+        if not 0 <= idx < account_count():
+            raise ValidationError()
+        return idx
+
 app = Flask(__name__, static_url_path="/static")
+app.json = OrjsonProvider(app)
+app.url_map.converters["acctidx"] = AccountIndexConverter
 app.secret_key = os.getenv("FLASK_SECRET_KEY", "change-me-please")
 
 # Enable http on localhost during dev for OAuth
@@ -32,8 +54,23 @@ SCOPES = [
     "https://www.googleapis.com/auth/youtubepartner",
 ]
 
-# one lock per account index to prevent concurrent runs
+# bounded pool for uploads: bursts of /run wait in the queue (status "queued")
+# instead of each spawning a thread
+_run_pool = ThreadPoolExecutor(max_workers=int(os.getenv("RUN_POOL", "4")), thread_name_prefix="run")
+atexit.register(_run_pool.shutdown, wait=True)
+
+# one lock per state_prefix, held from /run until the run finishes, so a
+# double click can't start two uploads; is_run_active() covers other workers
 _run_locks = {}
+_run_locks_guard = threading.Lock()
+
+# shared pool for the dashboard's per-account YouTube lookups
+_dashboard_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="dashboard")
+
+# /status is polled by every open tab: serve one snapshot for a short window
+STATUS_CACHE_SECONDS = 0.5
+_status_cache = {"t": 0.0, "data": None}
+_status_cache_lock = threading.Lock()
 
 # ---------------------------------------------------
 # Helpers
@@ -41,16 +78,48 @@ _run_locks = {}
 def _safe_idx(idx, accounts):
     return idx is not None and 0 <= idx < len(accounts)
 
+def _account_at(accounts, idx):
+    # the acctidx converter checked idx before this list was read: an account
+    # deleted in between would otherwise be an IndexError (500)
+    if not _safe_idx(idx, accounts):
+        abort(404)
+    return accounts[idx]
+
 def _redirect_base():
     # e.g. http://127.0.0.1:5000
     return request.url_root.rstrip("/")
 
-def background_run(acct, idx: int):
+def _invalidate_status_cache():
+    _status_cache["t"] = 0.0
+
+def _run_lock(prefix):
+    with _run_locks_guard:
+        lock = _run_locks.get(prefix)
+        if lock is None:
+            lock = _run_locks[prefix] = threading.Lock()
+        return lock
+
+def _locked_run(lock, acct, job_id):
     try:
-        _run_locks[idx] = True
-        run_account(acct)
+        return run_account(acct, job_id)
     finally:
-        _run_locks[idx] = False
+        lock.release()
+
+def _channel_summary(acct):
+    """(authed, channel_title, channel_url) for one account; never raises."""
+    try:
+        authed = has_valid_credentials(acct)
+    except Exception:
+        authed = False
+    if not authed:
+        return False, None, None
+    try:
+        info = get_channel_info(acct)
+        if not info:
+            return True, "(Unknown Channel)", None
+        return True, info["title"], get_channel_url(info)
+    except Exception:
+        return True, "(Unknown Channel)", None
 
 # ---------------------------------------------------
 # Routes: Dashboard
@@ -65,218 +134,211 @@ def index():
         acct["status_parsed"] = None
         if st.get("status") == "success":
             try:
-                acct["status_parsed"] = json.loads(st.get("message") or "{}")
+                acct["status_parsed"] = orjson.loads(st.get("message") or "{}")
             except Exception:
                 pass
 
-        # auth check
-        try:
-            acct["authed"] = has_valid_credentials(acct)
-        except Exception:
-            acct["authed"] = False
-
-        # channel info if authed
-        if acct["authed"]:
-            try:
-                info = get_channel_info(acct)
-                acct["channel_title"] = info["title"] if info else "(Unknown Channel)"
-                acct["channel_url"] = get_channel_url(info) if info else None
-            except Exception:
-                acct["channel_title"] = "(Unknown Channel)"
-                acct["channel_url"] = None
-        else:
-            acct["channel_title"] = None
-            acct["channel_url"] = None
+    # auth check + channel info: one YouTube round-trip per account, run in parallel
+    for acct, summary in zip(accounts, _dashboard_pool.map(_channel_summary, accounts)):
+        acct["authed"], acct["channel_title"], acct["channel_url"] = summary
 
     return render_template("index.html", accounts=accounts)
 
 @app.route("/status")
 def all_status():
-    accounts = load_accounts()
-    return jsonify([load_status(acct.get("state_prefix", "")) for acct in accounts])
-
-@app.route("/run/<int:idx>", methods=["POST"])
+    if time.monotonic() - _status_cache["t"] < STATUS_CACHE_SECONDS:
+        return jsonify(_status_cache["data"])
+    with _status_cache_lock:
+        # single flight: pollers that queued behind the lock reuse the fresh snapshot
+        if time.monotonic() - _status_cache["t"] >= STATUS_CACHE_SECONDS:
+            accounts = load_accounts()
+            _status_cache["data"] = [load_status(acct.get("state_prefix", "")) for acct in accounts]
+            _status_cache["t"] = time.monotonic()
+        data = _status_cache["data"]
+    return jsonify(data)
+
+@app.route("/run/<acctidx:idx>", methods=["POST"])
 def run_now(idx):
-    accounts = load_accounts()
-    if not _safe_idx(idx, accounts):
-        return jsonify({"error": "Invalid account index"}), 400
-    if _run_locks.get(idx):
-        return jsonify({"error": "Already running"}), 429
-    if not has_valid_credentials(accounts[idx]):
+    acct = _account_at(load_accounts(), idx)
+    prefix = acct.get("state_prefix", "")
+    if not has_valid_credentials(acct):
         return jsonify({"error": "Account is not authorized yet"}), 400
 
-    t = threading.Thread(target=background_run, args=(accounts[idx], idx), daemon=True)
-    t.start()
-    return jsonify({"status": "started"}), 202
+    lock = _run_lock(prefix)
+    if not lock.acquire(blocking=False):
+        return jsonify({"error": "Already running"}), 429
+    submitted = False
+    try:
+        if is_run_active(prefix):
+            app.logger.warning("Run for %s is already active in another worker process", prefix)
+            return jsonify({"error": "Already running"}), 429
+        # mark queued before submitting so other workers see it immediately
+        job_id = uuid.uuid4().hex
+        save_status(prefix, "queued", "", job_id)
+        _invalidate_status_cache()
+        _run_pool.submit(_locked_run, lock, acct, job_id)
+        submitted = True
+    finally:
+        # once submitted, _locked_run releases it when the run ends
+        if not submitted:
+            lock.release()
+    return jsonify({"status": "started", "job_id": job_id}), 202
 
 # ---------------------------------------------------
 # Routes: Preview / Scan / Force / Used
 # ---------------------------------------------------
-@app.route("/preview/<int:idx>")
+@app.route("/preview/<acctidx:idx>")
 def preview_next(idx):
-    accounts = load_accounts()
-    if not _safe_idx(idx, accounts):
-        return jsonify({"error": "Invalid account index"}), 400
-    url = peek_next_video_url(accounts[idx])
+    url = peek_next_video_url(_account_at(load_accounts(), idx))
     return jsonify({"next_video_url": url})
 
-@app.route("/scan/<int:idx>")
+@app.route("/scan/<acctidx:idx>")
 def scan(idx):
-    accounts = load_accounts()
-    if not _safe_idx(idx, accounts):
-        return jsonify({"error": "Invalid account index"}), 400
+    acct = _account_at(load_accounts(), idx)
     try:
         limit = int(request.args.get("limit", 50))
     except ValueError:
         limit = 50
     include_used = request.args.get("include_used", "true").lower() in ("1", "true", "yes")
-    items = scan_candidates(accounts[idx], limit=limit, include_used=include_used)
+    items = scan_candidates(acct, limit=limit, include_used=include_used)
     return jsonify(items)
 
-@app.route("/force-next/<int:idx>", methods=["POST"])
+@app.route("/force-next/<acctidx:idx>", methods=["POST"])
 def force_next(idx):
-    accounts = load_accounts()
-    if not _safe_idx(idx, accounts):
-        return jsonify({"error": "Invalid account index"}), 400
+    acct = _account_at(load_accounts(), idx)
     data = request.get_json(silent=True) or {}
     name = (data.get("name") or "").strip()
     if not name:
         return jsonify({"error": "Missing name"}), 400
-    set_force_next(accounts[idx]["state_prefix"], name)
+    set_force_next(acct["state_prefix"], name)
     return jsonify({"status": "ok", "forced": name})
 
-@app.route("/used/<int:idx>")
+@app.route("/used/<acctidx:idx>")
 def used_list(idx):
     from yt_runner import load_used_list
-    accounts = load_accounts()
-    if not _safe_idx(idx, accounts):
-        return jsonify({"error": "Invalid account index"}), 400
-    used = load_used_list(accounts[idx]["state_prefix"])
+    used = load_used_list(_account_at(load_accounts(), idx)["state_prefix"])
     return jsonify(used)
 
-@app.route("/used/<int:idx>/clear", methods=["POST"])
+@app.route("/used/<acctidx:idx>/clear", methods=["POST"])
 def clear_used(idx):
-    accounts = load_accounts()
-    if not _safe_idx(idx, accounts):
-        return jsonify({"error": "Invalid account index"}), 400
-    reset_used_list(accounts[idx]["state_prefix"])
+    reset_used_list(_account_at(load_accounts(), idx)["state_prefix"])
     return jsonify({"status": "ok"})
 
 # ---------------------------------------------------
 # Routes: Channel info (optional for UI widgets)
 # ---------------------------------------------------
-@app.route("/latest/<int:idx>")
+@app.route("/latest/<acctidx:idx>")
 def latest_uploads(idx):
-    accounts = load_accounts()
-    if not _safe_idx(idx, accounts):
-        return jsonify({"error": "Invalid account index"}), 400
-    if not has_valid_credentials(accounts[idx]):
+    acct = _account_at(load_accounts(), idx)
+    if not has_valid_credentials(acct):
         return jsonify({"error": "Account is not authorized"}), 400
-    items = list_recent_uploads(accounts[idx], max_results=int(request.args.get("n", 5)))
+    items = list_recent_uploads(acct, max_results=int(request.args.get("n", 5)))
     return jsonify(items)
 
 # ---------------------------------------------------
 # Routes: Account CRUD
 # ---------------------------------------------------
 @app.route("/account/new", methods=["GET", "POST"])
-@app.route("/account/<int:idx>/edit", methods=["GET", "POST"])
+@app.route("/account/<acctidx:idx>/edit", methods=["GET", "POST"])
 def account_form(idx=None):
-    accounts = load_accounts()
-    acct = accounts[idx] if _safe_idx(idx, accounts) else {}
-
     if request.method == "POST":
-        # Normalize token file path from form
-        state_prefix = request.form["state_prefix"].strip()
-        token_file_raw = request.form["token_file"].strip()
-        token_file = token_file_raw.replace("\\", "/").rstrip("/")
-        if token_file.lower() in ("", "tokens"):
-            token_file = f"tokens/{state_prefix}.json"
-        if os.path.isdir(token_file):
-            token_file = os.path.join(token_file, f"{state_prefix}.json")
-        os.makedirs(os.path.dirname(token_file) or ".", exist_ok=True)
-
-        data = {
-            "name": request.form["name"].strip(),
-            "state_prefix": state_prefix,
-            "type": request.form["type"].strip(),
-            "video_base_url": request.form["video_base_url"].strip(),
-
-            # optional content sources
-            "manifest_url": request.form.get("manifest_url", "").strip(),
-            "title_url": request.form.get("title_url", "").strip(),
-            "description_url": request.form.get("description_url", "").strip(),
-            "tags_url": request.form.get("tags_url", "").strip(),
-
-            # thumbnail sources
-            "thumbnail_url": request.form.get("thumbnail_url", "").strip(),
-            "thumb_manifest_url": request.form.get("thumb_manifest_url", "").strip(),
-            "thumbnail_base_url": request.form.get("thumbnail_base_url", "").strip(),
-
-            "slides_per_post": int(request.form.get("slides_per_post", "1") or "1"),
-            "client_secrets_file": request.form["client_secrets_file"].strip(),
-            "token_file": token_file,
-
-            # upload options
-            "privacy_status": request.form.get("privacy_status", "private"),
-            "category_id": request.form.get("category_id", "22"),
-            "made_for_kids": request.form.get("made_for_kids", "false"),
-            "self_declared_mfk": request.form.get("self_declared_mfk", "false"),
-            "default_language": request.form.get("default_language", "").strip(),
-            "playlist_id": request.form.get("playlist_id", "").strip(),
-            "schedule_publish_at": request.form.get("schedule_publish_at", "").strip(),
-
-            # candidate generation
-            "include_plain_vid": request.form.get("include_plain_vid", "auto").strip(),
-            "max_index": int(request.form.get("max_index", "2000") or "2000"),
-        }
-
-        # ---- Uniqueness validation (prevents token reuse & prefix collisions) ----
-        others = [a for i, a in enumerate(accounts) if i != (idx if idx is not None else -1)]
-
-        # (a) unique state_prefix
-        if any(a.get("state_prefix") == data["state_prefix"] for a in others):
-            flash("State Prefix must be unique. Another account already uses this prefix.", "error")
-            return render_template("account_form.html", account=data), 400
-
-        # (b) unique token_file path (avoid reusing tokens across accounts)
-        tf_norm = os.path.normpath(data["token_file"]).lower()
-        if any(os.path.normpath(a.get("token_file", "")).lower() == tf_norm
-               and a.get("state_prefix") != data["state_prefix"] for a in others):
-            flash("Token File path is already used by another account. Choose a unique file.", "error")
-            return render_template("account_form.html", account=data), 400
-
-        # Save/Update
-        if acct and idx is not None:
-            accounts[idx] = data
-        else:
-            accounts.append(data)
-
-        save_accounts(accounts)
-        flash("Account saved")
-        return redirect(url_for("index"))
+        # validate and save against the current file, under the accounts lock
+        with with_accounts() as accounts:
+            # settings the form has no input for keep their current value
+            existing = _account_at(accounts, idx) if idx is not None else {}
+
+            # Normalize token file path from form
+            state_prefix = request.form["state_prefix"].strip()
+            token_file_raw = request.form["token_file"].strip()
+            token_file = token_file_raw.replace("\\", "/").rstrip("/")
+            if token_file.lower() in ("", "tokens"):
+                token_file = f"tokens/{state_prefix}.json"
+            if os.path.isdir(token_file):
+                token_file = os.path.join(token_file, f"{state_prefix}.json")
+            os.makedirs(os.path.dirname(token_file) or ".", exist_ok=True)
+
+            data = {
+                "name": request.form["name"].strip(),
+                "state_prefix": state_prefix,
+                "type": request.form["type"].strip(),
+                "video_base_url": request.form["video_base_url"].strip(),
+
+                # optional content sources
+                "manifest_url": request.form.get("manifest_url", "").strip(),
+                "trust_manifest": request.form.get("trust_manifest", existing.get("trust_manifest", "true")),
+                "title_url": request.form.get("title_url", "").strip(),
+                "description_url": request.form.get("description_url", "").strip(),
+                "tags_url": request.form.get("tags_url", "").strip(),
+
+                # thumbnail sources
+                "thumbnail_url": request.form.get("thumbnail_url", "").strip(),
+                "thumb_manifest_url": request.form.get("thumb_manifest_url", "").strip(),
+                "thumbnail_base_url": request.form.get("thumbnail_base_url", "").strip(),
+
+                "slides_per_post": int(request.form.get("slides_per_post", "1") or "1"),
+                "client_secrets_file": request.form["client_secrets_file"].strip(),
+                "token_file": token_file,
+
+                # upload options
+                "privacy_status": request.form.get("privacy_status", "private"),
+                "category_id": request.form.get("category_id", "22"),
+                "made_for_kids": request.form.get("made_for_kids", "false"),
+                "self_declared_mfk": request.form.get("self_declared_mfk", "false"),
+                "default_language": request.form.get("default_language", "").strip(),
+                "playlist_id": request.form.get("playlist_id", "").strip(),
+                "schedule_publish_at": request.form.get("schedule_publish_at", "").strip(),
+
+                # candidate generation
+                "include_plain_vid": request.form.get("include_plain_vid", "auto").strip(),
+                "max_index": int(request.form.get("max_index", "2000") or "2000"),
+            }
+            # optional: when unset, upload_video uses UPLOAD_CHUNK_MB
+            chunk_mb = request.form.get("upload_chunksize_mb") or existing.get("upload_chunksize_mb")
+            if chunk_mb:
+                data["upload_chunksize_mb"] = int(chunk_mb)
+
+            # ---- Uniqueness validation (prevents token reuse & prefix collisions) ----
+            others = [a for i, a in enumerate(accounts) if i != (idx if idx is not None else -1)]
+
+            # (a) unique state_prefix
+            if any(a.get("state_prefix") == data["state_prefix"] for a in others):
+                flash("State Prefix must be unique. Another account already uses this prefix.", "error")
+                return render_template("account_form.html", account=data), 400
+
+            # (b) unique token_file path (avoid reusing tokens across accounts)
+            tf_norm = os.path.normpath(data["token_file"]).lower()
+            if any(os.path.normpath(a.get("token_file", "")).lower() == tf_norm
+                   and a.get("state_prefix") != data["state_prefix"] for a in others):
+                flash("Token File path is already used by another account. Choose a unique file.", "error")
+                return render_template("account_form.html", account=data), 400
+
+            # Save/Update (written when the with-block exits)
+            if idx is not None:
+                accounts[idx] = data
+            else:
+                accounts.append(data)
+
+            flash("Account saved")
+            return redirect(url_for("index"))
 
     # GET
+    acct = _account_at(load_accounts(), idx) if idx is not None else {}
     return render_template("account_form.html", account=acct)
 
-@app.route("/account/<int:idx>/delete", methods=["POST"])
+@app.route("/account/<acctidx:idx>/delete", methods=["POST"])
 def account_delete(idx):
-    accounts = load_accounts()
-    if not _safe_idx(idx, accounts):
-        return jsonify({"error": "Invalid account index"}), 400
-    accounts.pop(idx)
-    save_accounts(accounts)
+    with with_accounts() as accounts:
+        if idx < len(accounts):
+            accounts.pop(idx)
     flash("Account deleted")
     return redirect(url_for("index"))
 
 # ---------------------------------------------------
 # Routes: OAuth
 # ---------------------------------------------------
-@app.route("/auth/<int:idx>/start")
+@app.route("/auth/<acctidx:idx>/start")
 def auth_start(idx):
-    accounts = load_accounts()
-    if not _safe_idx(idx, accounts):
-        abort(404)
-    acct = accounts[idx]
+    acct = _account_at(load_accounts(), idx)
     flow = get_auth_flow_for_account(acct, SCOPES, _redirect_base())
     auth_url, state = flow.authorization_url(
         access_type="offline",
@@ -305,9 +367,15 @@ def oauth2callback():
         flow.redirect_uri = _redirect_base() + "/oauth2callback"
         flow.fetch_token(authorization_response=request.url)
         creds = flow.credentials
-        store_credentials_for_account(acct, creds)  # writes token file & updates accounts.json
-        accounts[idx] = acct
-        save_accounts(accounts)
+        # writes the token file; accounts.json is rewritten once, on leaving the block
+        with with_accounts() as current:
+            prefix = acct.get("state_prefix")
+            if not any(a.get("state_prefix") == prefix for a in current):
+                return "Account was removed during authorization", 400
+            # merge only the token path: `acct` was read before the slow token
+            # exchange, and the account may have been edited since
+            update = {"state_prefix": prefix, "token_file": acct.get("token_file")}
+            store_credentials_for_account(update, creds, current)
         flash("Authorization successful")
         return redirect(url_for("index"))
     except Exception as e:
@@ -0,0 +1,16 @@
+# Gunicorn config for serving app.py in production:
+#   gunicorn app:app
+#
+# The app is I/O bound (disk JSON, CDN probes, YouTube API), so a single
+# process with a pool of threads serves concurrent /status, /scan and
+# /preview callers without the per-request overhead of the dev server.
+import os
+
+bind = f"{os.getenv('FLASK_HOST', '127.0.0.1')}:{os.getenv('FLASK_PORT', '5000')}"
+worker_class = "gthread"
+workers = int(os.getenv("WEB_WORKERS", "1"))
+threads = int(os.getenv("WEB_THREADS", "32"))
+# uploads run in background threads; long CDN scans must not trip the worker timeout
+timeout = int(os.getenv("WEB_TIMEOUT", "300"))
+graceful_timeout = 30
+keepalive = 5
@@ -1,64 +1,338 @@
 #!/usr/bin/env python3
-import os, json, tempfile, requests
+import os, re, time, uuid, asyncio, shutil, sqlite3, hashlib, itertools, tempfile, threading, requests
+import orjson
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from functools import lru_cache
 from urllib.parse import quote
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
-from typing import Optional, Tuple, List, Dict
+from typing import Optional, Tuple, List, Dict, IO, Iterable
 
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload
 from googleapiclient.errors import HttpError
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
 from google.auth.transport.requests import Request as GARequest
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 ACCOUNTS_FILE = "accounts.json"
 STATUS_SUFFIX = "_status.json"
+# validators + parsed lines of fetched text files, for conditional GETs
+HTTP_CACHE_DIR = "cache"
+# fetched lines are reused in-process this long (seconds) before revalidating
+FETCH_MEMO_TTL = 60
+# rotating indices (title/description/tags/thumbnail) for every account
+STATE_DB = "state.db"
+# a "queued"/"running" status older than this is treated as a dead run
+RUN_STALE_SECONDS = 6 * 3600
+# how long dashboard channel info is reused before asking YouTube again
+CHANNEL_INFO_TTL = 300
+# small side fetches (metadata files, thumbnails) that overlap other work
+IO_WORKERS = 8
+# candidate URLs probed concurrently, and how many are probed per batch
+PROBE_WORKERS = 32
+PROBE_BATCH = 64
+# probe results are reused for this long (seconds) before asking the CDN again;
+# misses expire sooner so newly uploaded files are picked up quickly
+PROBE_TTL_HIT = 3600
+PROBE_TTL_MISS = 900
+# any probed URL is answered from memory this long (seconds), whatever the caller
+PROBE_MEMO_TTL = 60
+# picks only probe up to the known end of the vid (N).mp4 sequence; the rest of
+# the range (files past a numbering gap) is walked at most this often (seconds)
+SCAN_FULL_PASS_SECONDS = 3600
+# downloaded videos stay in memory up to this size before spilling to a temp file
+VIDEO_SPOOL_MAX = 50 * 1024 * 1024
+# resumable upload chunk size (MiB); bigger chunks mean fewer PUT round-trips,
+# each chunk is buffered in memory. Per account: "upload_chunksize_mb"
+UPLOAD_CHUNK_MB = 32
+# accepted video extensions; extension-less names are tried in this order (most common first)
+VIDEO_EXTS = (".mp4", ".mov", ".m4v", ".webm")
+
+# =========================
+# HTTP session
+# =========================
+# one pooled session so repeated fetches/probes to the same host reuse TCP+TLS
+SESSION = requests.Session()
+_http_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64,
+                            max_retries=Retry(total=2, backoff_factor=0.3))
+SESSION.mount("https://", _http_adapter)
+SESSION.mount("http://", _http_adapter)
+
+# existence probes: a failed probe just reads as "missing", so never retry them
+PROBE_SESSION = requests.Session()
+_probe_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0)
+PROBE_SESSION.mount("https://", _probe_adapter)
+PROBE_SESSION.mount("http://", _probe_adapter)
+
+# =========================
+# JSON I/O
+# =========================
+def _read_json(path):
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+# process umask, read once at import (os.umask can only be read by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def _atomic_write(path, data: bytes, fsync=True, mode=None):
+    # write a sibling temp file, then swap it in: readers never see a torn file,
+    # and with fsync a crash can't leave an empty one behind either
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".",
+                               prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            # mkstemp creates 0600: keep the target's mode, or what open("w") would give
+            if mode is None:
+                try:
+                    mode = os.stat(path).st_mode & 0o7777
+                except FileNotFoundError:
+                    mode = 0o666 & ~_UMASK
+            os.chmod(tmp, mode)
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+_ensured_dirs = set()
+
+def _ensure_dir_once(path):
+    # makedirs only the first time a directory is seen in this process
+    path = path or "."
+    if path not in _ensured_dirs:
+        os.makedirs(path, exist_ok=True)
+        _ensured_dirs.add(path)
+
+def _write_json(path, data, scratch=False, mode=None):
+    # files people may open by hand are indented and fsynced; scratch files
+    # (status, caches, hints) are minified and not synced: losing one costs a recompute
+    if scratch:
+        _atomic_write(path, orjson.dumps(data), fsync=False, mode=mode)
+    else:
+        _atomic_write(path, orjson.dumps(data, option=orjson.OPT_INDENT_2), mode=mode)
+
+_json_cache = {}  # path -> ((inode, mtime_ns, size), parsed)
+_json_cache_lock = threading.Lock()
+
+def _load_json_cached(path, default):
+    """Parsed JSON at `path`; the file is only re-read when its inode/mtime/size changes."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return default
+    # atomic writes always swap in a new inode, even within one mtime tick
+    key = (st.st_ino, st.st_mtime_ns, st.st_size)
+    with _json_cache_lock:
+        hit = _json_cache.get(path)
+    if hit and hit[0] == key:
+        return hit[1]
+    data = _read_json(path)
+    with _json_cache_lock:
+        _json_cache[path] = (key, data)
+    return data
+
+def _invalidate_json_cache(path):
+    with _json_cache_lock:
+        _json_cache.pop(path, None)
 
 # =========================
 # Status I/O
 # =========================
+# identifies this process in run ownership, even if a restart reuses its pid
+_BOOT_ID = uuid.uuid4().hex
+
 def status_path(prefix): return f"{prefix}{STATUS_SUFFIX}"
 
-def save_status(prefix, status, message=""):
+def save_status(prefix, status, message="", job_id=None):
     data = {
-        "last_run": datetime.utcnow().replace(microsecond=0).isoformat() + "Z",
+        "last_run": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
         "status": status,
         "message": (message or "")[:2000],
     }
-    os.makedirs(os.path.dirname(status_path(prefix)) or ".", exist_ok=True)
-    with open(status_path(prefix), "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    if job_id:
+        data["job_id"] = job_id
+    if status in ("queued", "running"):
+        data["owner"] = {"pid": os.getpid(), "boot": _BOOT_ID}
+    _ensure_dir_once(os.path.dirname(status_path(prefix)))
+    _write_json(status_path(prefix), data, scratch=True)
+    _invalidate_json_cache(status_path(prefix))
 
 def load_status(prefix):
-    p = status_path(prefix)
-    return json.load(open(p, "r", encoding="utf-8")) if os.path.isfile(p) else {
+    data = _load_json_cached(status_path(prefix), None)
+    # copy: callers annotate the returned dict
+    return dict(data) if data is not None else {
         "last_run": None, "status": "never", "message": ""
     }
 
+def _pid_alive(pid) -> bool:
+    if not isinstance(pid, int) or pid <= 0:
+        return False
+    if os.name == "nt":
+        # os.kill would terminate the process on Windows: just try to open it
+        import ctypes
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)  # QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def is_run_active(prefix) -> bool:
+    """True while a run for this prefix is queued/running in any worker process."""
+    st = load_status(prefix)
+    if st.get("status") not in ("queued", "running"):
+        return False
+    # a run owned by a process that is gone (restart, reloader, recycled
+    # worker) will never finish: don't let it block new runs
+    owner = st.get("owner")
+    if owner:
+        if owner.get("pid") == os.getpid():
+            if owner.get("boot") != _BOOT_ID:
+                return False  # an earlier process that happened to get our pid
+        elif not _pid_alive(owner.get("pid")):
+            return False
+    try:
+        started = datetime.strptime(st.get("last_run") or "", "%Y-%m-%dT%H:%M:%SZ")
+    except ValueError:
+        return False
+    return (datetime.utcnow() - started).total_seconds() < RUN_STALE_SECONDS
+
 # =========================
 # Small state helpers
 # =========================
+_state_db = None
+_state_db_lock = threading.Lock()
+
+def _db():
+    # callers hold _state_db_lock; one connection shared by all threads
+    global _state_db
+    if _state_db is None:
+        conn = sqlite3.connect(STATE_DB, timeout=10, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS counters ("
+                     "prefix TEXT NOT NULL, key TEXT NOT NULL, idx INTEGER NOT NULL, "
+                     "PRIMARY KEY (prefix, key))")
+        _state_db = conn
+    return _state_db
+
+# pre-SQLite index files, read until the counter is first written
 def _state_file(prefix, key): return f"{prefix}_{key}.json"
 
+def _legacy_last_index(prefix, key):
+    try:
+        return _read_json(_state_file(prefix, key)).get("last_index", 0)
+    except FileNotFoundError:
+        return 0
+
+def _get_index(conn, prefix, key):
+    row = conn.execute("SELECT idx FROM counters WHERE prefix = ? AND key = ?",
+                       (prefix, key)).fetchone()
+    return row[0] if row else _legacy_last_index(prefix, key)
+
 def load_last_index(prefix, key):
-    fn = _state_file(prefix, key)
-    if not os.path.isfile(fn): return 0
-    return json.load(open(fn, "r", encoding="utf-8")).get("last_index", 0)
+    with _state_db_lock:
+        return _get_index(_db(), prefix, key)
 
 def save_last_index(prefix, key, idx):
-    fn = _state_file(prefix, key)
-    with open(fn, "w", encoding="utf-8") as f:
-        json.dump({"last_index": idx}, f, indent=2)
+    with _state_db_lock:
+        _db().execute("INSERT OR REPLACE INTO counters (prefix, key, idx) VALUES (?, ?, ?)",
+                      (prefix, key, idx))
+
+def claim_indices(prefix, keys) -> Dict[str, int]:
+    """Returns the current index of each key and advances them all in one transaction."""
+    claimed = {}
+    with _state_db_lock:
+        conn = _db()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for key in keys:
+                claimed[key] = _get_index(conn, prefix, key)
+                conn.execute("INSERT OR REPLACE INTO counters (prefix, key, idx) VALUES (?, ?, ?)",
+                             (prefix, key, claimed[key] + 1))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    return claimed
+
+# used videos: one filename per line, appended as videos are picked
+def _used_file(prefix): return f"{prefix}_video_used.txt"
+def _legacy_used_file(prefix): return f"{prefix}_video_used.json"
 
 def load_used_list(prefix) -> List[str]:
-    fn = f"{prefix}_video_used.json"
-    if not os.path.isfile(fn): return []
-    return json.load(open(fn, "r", encoding="utf-8")).get("used", [])
+    try:
+        with open(_used_file(prefix), "r", encoding="utf-8") as f:
+            return f.read().splitlines()
+    except FileNotFoundError:
+        pass
+    try:
+        return _read_json(_legacy_used_file(prefix)).get("used", [])
+    except FileNotFoundError:
+        return []
 
 def save_used_list(prefix, used: List[str]):
-    fn = f"{prefix}_video_used.json"
-    with open(fn, "w", encoding="utf-8") as f:
-        json.dump({"used": used}, f, indent=2)
+    _atomic_write(_used_file(prefix), "".join(n + "\n" for n in used).encode("utf-8"))
+    with _used_cache_lock:
+        _used_cache.pop(prefix, None)
+
+def mark_used(prefix, name):
+    fn = _used_file(prefix)
+    if not os.path.isfile(fn):
+        # first write in the line format: carry over a legacy JSON list
+        save_used_list(prefix, load_used_list(prefix))
+    with open(fn, "a", encoding="utf-8") as f:
+        f.write(name + "\n")
+    with _used_cache_lock:
+        hit = _used_cache.get(prefix)
+        if hit:
+            hit[1].add(name)
+            _used_cache[prefix] = (_file_key(fn), hit[1])
+
+_used_cache = {}  # prefix -> ((mtime_ns, size), set of names)
+_used_cache_lock = threading.Lock()
+
+def _file_key(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def _used_set(prefix) -> set:
+    """Used names for membership tests; cached until the used file changes. Don't mutate."""
+    key = _file_key(_used_file(prefix))
+    with _used_cache_lock:
+        hit = _used_cache.get(prefix)
+    if key is not None and hit and hit[0] == key:
+        return hit[1]
+    used = set(load_used_list(prefix))
+    if key is not None:
+        with _used_cache_lock:
+            _used_cache[prefix] = (key, used)
+    return used
 
 def reset_used_list(prefix):
     save_used_list(prefix, [])
@@ -67,85 +341,215 @@ def reset_used_list(prefix):
 def _force_next_file(prefix): return f"{prefix}_force_next.json"
 
 def get_force_next(prefix) -> Optional[str]:
-    fn = _force_next_file(prefix)
-    if not os.path.isfile(fn): return None
-    data = json.load(open(fn, "r", encoding="utf-8"))
-    return data.get("name")
+    data = _load_json_cached(_force_next_file(prefix), None)
+    return data.get("name") if data else None
 
 def set_force_next(prefix, name: Optional[str]):
     fn = _force_next_file(prefix)
     if not name:
-        if os.path.isfile(fn):
+        try:
             os.remove(fn)
-        return
-    with open(fn, "w", encoding="utf-8") as f:
-        json.dump({"name": name}, f, indent=2)
+        except FileNotFoundError:
+            pass
+    else:
+        _write_json(fn, {"name": name})
+    _invalidate_json_cache(fn)
 
 # =========================
 # Accounts file
 # =========================
+# serializes writers; re-entrant so a read-modify-write can call save_accounts()
+_accounts_lock = threading.RLock()
+
 def load_accounts(path=ACCOUNTS_FILE):
-    return json.load(open(path, "r", encoding="utf-8")) if os.path.isfile(path) else []
+    # shallow copies: the dashboard decorates each account dict per request
+    return [dict(a) for a in _load_json_cached(path, [])]
+
+@contextmanager
+def _file_lock(lock_path):
+    # exclusive OS-level lock, so writers in other worker processes wait too
+    with open(lock_path, "a+b") as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+@contextmanager
+def with_accounts(path=ACCOUNTS_FILE):
+    """
+    Loads the accounts once and yields the list for in-place edits; on exit it is
+    saved if it changed. Other writers (threads or processes) wait meanwhile.
+    """
+    with _accounts_lock, _file_lock(path + ".lock"):
+        # read the file itself, not the cache: the edit must start from what's on disk
+        try:
+            accounts = _read_json(path)
+        except FileNotFoundError:
+            accounts = []
+        before = [dict(a) for a in accounts]
+        yield accounts
+        if accounts != before:
+            save_accounts(accounts, path)
+
+def account_count(path=ACCOUNTS_FILE):
+    return len(_load_json_cached(path, []))
 
 def save_accounts(accounts, path=ACCOUNTS_FILE):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(accounts, f, indent=2)
+    with _accounts_lock:
+        _write_json(path, accounts)
+        _invalidate_json_cache(path)
 
 # =========================
 # Content fetchers
 # =========================
+_io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="io")
+
+def _http_cache_file(url):
+    return os.path.join(HTTP_CACHE_DIR, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+_fetch_memo = {}  # url -> (fetched_at, lines)
+_fetch_memo_lock = threading.Lock()
+
 def fetch_lines(url):
-    r = requests.get(url, timeout=30)
+    now = time.monotonic()
+    with _fetch_memo_lock:
+        hit = _fetch_memo.get(url)
+    if hit and now - hit[0] < FETCH_MEMO_TTL:
+        return list(hit[1])
+    lines = _fetch_lines_revalidated(url)
+    with _fetch_memo_lock:
+        _fetch_memo[url] = (now, lines)
+    return list(lines)
+
+def _fetch_lines_revalidated(url):
+    # conditional GET: an unchanged remote file answers 304 and we reuse the cached lines
+    cache_fn = _http_cache_file(url)
+    try:
+        cached = _read_json(cache_fn)
+    except (OSError, ValueError):
+        cached = None
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    r = SESSION.get(url, timeout=30, headers=headers)
+    if r.status_code == 304 and cached:
+        return cached["lines"]
     r.raise_for_status()
-    return [l.strip() for l in r.text.splitlines() if l.strip()]
-
-def next_title(cfg):
-    if not cfg.get("title_url"):
-        return f"Untitled {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')}"
-    lines = fetch_lines(cfg["title_url"])
-    idx = load_last_index(cfg["state_prefix"], "title")
-    title = lines[idx % len(lines)]
-    save_last_index(cfg["state_prefix"], "title", idx + 1)
-    return title
-
-def next_description(cfg):
-    if not cfg.get("description_url"):
-        return ""
-    lines = fetch_lines(cfg["description_url"])
-    idx = load_last_index(cfg["state_prefix"], "description")
-    desc = lines[idx % len(lines)]
-    save_last_index(cfg["state_prefix"], "description", idx + 1)
-    return desc
-
-def next_tags(cfg):
-    if not cfg.get("tags_url"):
-        return []
-    lines = fetch_lines(cfg["tags_url"])
-    idx = load_last_index(cfg["state_prefix"], "tags")
-    tags_line = lines[idx % len(lines)]
-    save_last_index(cfg["state_prefix"], "tags", idx + 1)
+    lines = [l.strip() for l in r.text.splitlines() if l.strip()]
+
+    etag, last_modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+    if etag or last_modified:
+        os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+        _write_json(cache_fn, {"url": url, "etag": etag, "last_modified": last_modified, "lines": lines},
+                    scratch=True)
+    return lines
+
+def _parse_tags(tags_line):
     return [t.strip().lstrip("#") for t in tags_line.replace(",", " ").split() if t.strip()][:500]
 
-def _download_to_tmp(url, suffix):
-    r = requests.get(url, timeout=90, stream=True)
+def _fetch_metadata_sources(cfg) -> Dict[str, Future]:
+    """Starts fetching the configured title/description/tags files on the I/O pool."""
+    return {key: _io_pool.submit(fetch_lines, cfg[f"{key}_url"])
+            for key in ("title", "description", "tags") if cfg.get(f"{key}_url")}
+
+def next_metadata(cfg, sources=None) -> Tuple[str, str, List[str]]:
+    """
+    (title, description, tags) in one go: the configured source files are
+    fetched concurrently (or taken from `sources`, see _fetch_metadata_sources)
+    and their indices advanced in a single transaction.
+    """
+    if sources is None:
+        sources = _fetch_metadata_sources(cfg)
+    lines = {key: fut.result() for key, fut in sources.items()}
+    idx = claim_indices(cfg["state_prefix"], list(lines)) if lines else {}
+
+    def pick(key):
+        return lines[key][idx[key] % len(lines[key])]
+
+    title = pick("title") if "title" in lines else f"Untitled {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')}"
+    description = pick("description") if "description" in lines else ""
+    tags = _parse_tags(pick("tags")) if "tags" in lines else []
+    return title, description, tags
+
+def _open_download(url):
+    # media is already compressed: ask for identity so bytes can be copied as-is
+    r = SESSION.get(url, timeout=90, stream=True, headers={"Accept-Encoding": "identity"})
     r.raise_for_status()
+    r.raw.decode_content = True
+    return r
+
+def _download_to_tmp(url, suffix):
+    r = _open_download(url)
     fd, path = tempfile.mkstemp(suffix=suffix)
-    with os.fdopen(fd, "wb") as f:
-        for chunk in r.iter_content(1024 * 512):
-            if chunk: f.write(chunk)
+    with r, os.fdopen(fd, "wb") as f:
+        shutil.copyfileobj(r.raw, f, length=1024 * 1024)
     return path
 
+def _download_to_spool(url) -> IO[bytes]:
+    """Downloads into a rewound temporary file object; the caller must close it."""
+    r = _open_download(url)
+    size = int(r.headers.get("Content-Length") or 0)
+    if size > VIDEO_SPOOL_MAX:
+        # known to be big: straight to disk, skipping the in-memory phase and rollover copy
+        spool = tempfile.TemporaryFile()
+        if hasattr(os, "posix_fadvise"):
+            # the upload reads it back front to back
+            os.posix_fadvise(spool.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    else:
+        spool = tempfile.SpooledTemporaryFile(max_size=VIDEO_SPOOL_MAX)
+    try:
+        with r:
+            shutil.copyfileobj(r.raw, spool, length=1024 * 1024)
+    except Exception:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
 # =========================
 # Candidate picking / scanning
 # =========================
+_probe_memo = {}  # url -> (checked_at, exists)
+_probe_memo_lock = threading.Lock()
+
 def _url_exists(url, timeout=8):
+    now = time.monotonic()
+    with _probe_memo_lock:
+        hit = _probe_memo.get(url)
+    if hit and now - hit[0] < PROBE_MEMO_TTL:
+        return hit[1]
+    exists = _probe_url(url, timeout)
+    with _probe_memo_lock:
+        if len(_probe_memo) > 50000:
+            _probe_memo.clear()  # crude bound; a few thousand entries per account in practice
+        _probe_memo[url] = (now, exists)
+    return exists
+
+def _probe_url(url, timeout):
+    # one ranged GET instead of HEAD (+ GET fallback on 405): every host accepts
+    # it and the body is at most a single byte
     try:
-        h = requests.head(url, timeout=timeout, allow_redirects=True)
-        if h.status_code == 405:
-            g = requests.get(url, timeout=timeout, stream=True)
-            g.close()
-            return g.status_code < 400
-        return h.status_code < 400
+        r = PROBE_SESSION.get(url, timeout=timeout, headers={"Range": "bytes=0-0"},
+                              stream=True, allow_redirects=True)
+        if r.status_code == 206:
+            r.content  # drain the 1-byte body so the connection goes back to the pool
+        else:
+            r.close()  # server ignored Range (or error): don't pull the body
+        # 206 = range served, 200 = server ignored Range but the file is there
+        return r.status_code in (200, 206)
     except Exception:
         return False
 
@@ -154,122 +558,266 @@ def _candidate_names_from_manifest(cfg) -> Optional[List[str]]:
     if not manifest: return None
     try:
         names = [ln for ln in fetch_lines(manifest)
-                 if ln.lower().endswith((".mp4", ".mov", ".m4v", ".webm"))]
+                 if ln.lower().endswith(VIDEO_EXTS)]
         return names or None
     except Exception:
         return None
 
-def _gen_candidates(cfg) -> List[str]:
+@lru_cache(maxsize=16)
+def _candidate_table(max_index, include_plain) -> Tuple[str, ...]:
+    """The vid.mp4 / vid (N).mp4 sequence, built once per (max_index, include_plain)."""
+    names = ["vid.mp4"] if include_plain in ("auto", "always") else []
+    names.extend(f"vid ({i}).mp4" for i in range(1, max_index + 1))
+    return tuple(names)
+
+def _gen_candidates(cfg, bounded=False) -> Iterable[str]:
+    """
+    Candidate names in pick order. With `bounded`, the vid (N).mp4 sequence
+    stops a little past the highest index known to exist (see
+    _pattern_upper_bound); the rest up to max_index follows only when there is
+    no usable hint or a full pass is due (SCAN_FULL_PASS_SECONDS), so files
+    past a numbering gap are still found.
+    """
     manifest_names = _candidate_names_from_manifest(cfg)
     if manifest_names:
         return manifest_names
     max_index = int(cfg.get("max_index", 2000))
-    include_plain = (cfg.get("include_plain_vid", "auto")).lower()
-    candidates = []
-    if include_plain in ("auto", "always"):
-        candidates.append("vid.mp4")
-    candidates.extend([f"vid ({i}).mp4" for i in range(1, max_index + 1)])
-    return candidates
+    table = _candidate_table(max_index, (cfg.get("include_plain_vid", "auto")).lower())
+    if not bounded:
+        return table
+    prefix, base = cfg["state_prefix"], cfg["video_base_url"].rstrip("/")
+    hint = _load_scan_hint(prefix, base)
+    bound = _pattern_upper_bound(prefix, base, max_index, int(hint.get("last_known_high_index", 0)))
+    if bound >= max_index:
+        return table
+    cut = bound + len(table) - max_index  # vid.mp4, when included, comes first
+    head = itertools.islice(table, cut)
+    if time.time() - hint.get("full_pass_at", 0) < SCAN_FULL_PASS_SECONDS:
+        return head
+    return itertools.chain(head, _full_pass_tail(prefix, base, table, cut))
+
+def _full_pass_tail(prefix, base, table, start):
+    yield from itertools.islice(table, start, None)
+    # only reached when a pick walked the whole tail without stopping on a hit
+    _save_scan_hint(prefix, base, full_pass_at=time.time())
+
+@lru_cache(maxsize=8192)
+def _quoted(name):
+    return quote(name, safe="")
+
+_probe_pool = ThreadPoolExecutor(max_workers=PROBE_WORKERS, thread_name_prefix="probe")
+
+def _find_video_url(base, name) -> Optional[str]:
+    """
+    URL of `name` under `base` if it exists. Extension-less names try VIDEO_EXTS
+    one at a time and stop at the first hit, so the usual .mp4 costs one probe.
+    """
+    base_name, ext = os.path.splitext(name)
+    for n in ([name] if ext else [base_name + e for e in VIDEO_EXTS]):
+        url = f"{base}/{_quoted(n)}"
+        if _url_exists(url):
+            return url
+    return None
+
+# per-account probe results: {"base": video_base_url, "entries": {name: {...}}}
+def _probe_cache_file(prefix): return f"{prefix}_probe_cache.json"
+
+def _load_probe_cache(prefix, base) -> Dict[str, Dict]:
+    try:
+        data = _read_json(_probe_cache_file(prefix))
+    except (OSError, ValueError):
+        return {}
+    # entries are only valid for the base URL they were probed against
+    return data.get("entries", {}) if data.get("base") == base else {}
+
+def _save_probe_cache(prefix, base, entries):
+    _write_json(_probe_cache_file(prefix), {"base": base, "entries": entries}, scratch=True)
 
-def _exts(): return [".mp4", ".mov", ".m4v", ".webm"]
+def _forget_probe(prefix, base, name, entries=None):
+    # pass the dict an _iter_existing loop is using, or its next save restores the entry
+    if entries is None:
+        entries = _load_probe_cache(prefix, base)
+    entry = entries.pop(name, None)
+    if entry is not None:
+        with _probe_memo_lock:
+            _probe_memo.pop(entry.get("url"), None)
+        _save_probe_cache(prefix, base, entries)
+
+# highest vid (N).mp4 index seen on the source, so picks probe the known range first
+_PATTERN_INDEX = re.compile(r"^vid \((\d+)\)\.mp4$")
+
+def _scan_hint_file(prefix): return f"{prefix}_scan_hint.json"
+
+# {"base", "last_known_high_index", "full_pass_at"}; only valid for its base URL
+def _load_scan_hint(prefix, base) -> Dict:
+    try:
+        data = _read_json(_scan_hint_file(prefix))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) and data.get("base") == base else {}
+
+def _save_scan_hint(prefix, base, **fields):
+    hint = {**_load_scan_hint(prefix, base), "base": base, **fields}
+    _write_json(_scan_hint_file(prefix), hint, scratch=True)
+
+def _note_scan_hit(prefix, base, *names):
+    # written only when the known end of the sequence moves up
+    top = max((int(m.group(1)) for m in map(_PATTERN_INDEX.match, names) if m), default=0)
+    if top > _load_scan_hint(prefix, base).get("last_known_high_index", 0):
+        _save_scan_hint(prefix, base, last_known_high_index=top)
+
+def _index_exists(base, i) -> bool:
+    return _find_video_url(base, f"vid ({i}).mp4") is not None
+
+def _pattern_upper_bound(prefix, base, max_index, hint) -> int:
+    """
+    End of the range picks probe first. Gallops up from the stored hint
+    (+1, +2, +4, ...) to the first miss, binary-searches the last hit in
+    between, and adds PROBE_BATCH of slack for small gaps. Without a usable
+    hint (first run, file gone, new base URL) it is max_index.
+    """
+    hint = min(hint, max_index)
+    if hint < 1 or not _index_exists(base, hint):
+        return max_index
+    lo, step = hint, 1
+    while lo + step <= max_index and _index_exists(base, lo + step):
+        lo += step
+        step *= 2
+    hi = min(lo + step, max_index + 1)  # first known miss, or past the end
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if _index_exists(base, mid):
+            lo = mid
+        else:
+            hi = mid
+    if lo != hint:
+        _save_scan_hint(prefix, base, last_known_high_index=lo)
+    return min(lo + PROBE_BATCH, max_index)
+
+def _iter_existing(base, names, prefix=None, cache=None):
+    """
+    Yields (name, url) for the names that exist, in the order given.
+    Names are probed PROBE_BATCH at a time on the probe pool, so callers that
+    stop at the first hit only pay for the batches they actually consume.
+    With `prefix`, fresh results from the account's probe cache skip the network;
+    pass `cache` (from _load_probe_cache) to share the dict being updated.
+    """
+    if cache is None and prefix:
+        cache = _load_probe_cache(prefix, base)
+    names = iter(names)
+    while True:
+        batch = list(itertools.islice(names, PROBE_BATCH))
+        if not batch:
+            return
+        now = time.time()
+        urls, todo = {}, []
+        for name in batch:
+            hit = cache.get(name) if cache is not None else None
+            ttl = PROBE_TTL_HIT if hit and hit["exists"] else PROBE_TTL_MISS
+            if hit and now - hit["checked_at"] < ttl:
+                urls[name] = hit["url"]
+            else:
+                todo.append(name)
+        for name, url in zip(todo, _probe_pool.map(lambda n: _find_video_url(base, n), todo)):
+            urls[name] = url
+            if cache is not None:
+                cache[name] = {"exists": url is not None, "url": url, "checked_at": now}
+        if todo and cache is not None:
+            _save_probe_cache(prefix, base, cache)
+        for name in batch:
+            if urls[name]:
+                yield name, urls[name]
 
 def peek_next_video_url(cfg) -> Optional[str]:
-    used = set(load_used_list(cfg["state_prefix"]))
+    used = _used_set(cfg["state_prefix"])
     base = cfg["video_base_url"].rstrip("/")
     force_name = get_force_next(cfg["state_prefix"])
     if force_name:
-        base_name, ext = os.path.splitext(force_name)
-        names = [force_name] if ext else [base_name + e for e in _exts()]
-        for n in names:
-            url = f"{base}/{quote(n, safe='')}"
-            if _url_exists(url):
-                return url
-    for name in _gen_candidates(cfg):
-        if name in used: continue
-        base_name, ext = os.path.splitext(name)
-        try_names = [name] if ext else [base_name + e for e in _exts()]
-        for n in try_names:
-            url = f"{base}/{quote(n, safe='')}"
-            if _url_exists(url): return url
+        url = _find_video_url(base, force_name)
+        if url:
+            return url
+    unused = (name for name in _gen_candidates(cfg, bounded=True) if name not in used)
+    for _, url in _iter_existing(base, unused, cfg["state_prefix"]):
+        return url
     return None
 
 def scan_candidates(cfg, limit=100, include_used=True) -> List[Dict]:
     base = cfg["video_base_url"].rstrip("/")
-    used = set(load_used_list(cfg["state_prefix"]))
+    used = _used_set(cfg["state_prefix"])
     force_name = get_force_next(cfg["state_prefix"])
-    results = []
-    count_found = 0
-    for name in _gen_candidates(cfg):
-        base_name, ext = os.path.splitext(name)
-        try_names = [name] if ext else [base_name + e for e in _exts()]
-        exists_any = False
-        final_url = None
-        for n in try_names:
-            url = f"{base}/{quote(n, safe='')}"
-            if _url_exists(url):
-                exists_any = True
-                final_url = url
-                break
-        info = {
-            "name": name,
-            "url": final_url,
-            "exists": bool(exists_any),
-            "used": name in used,
-            "is_force": (name == force_name)
-        }
-        if info["exists"]:
-            if include_used or not info["used"]:
-                results.append(info)
-                count_found += 1
-                if count_found >= limit:
-                    break
-    return results
-
-def next_video(cfg) -> Tuple[Optional[str], Optional[str]]:
-    used = set(load_used_list(cfg["state_prefix"]))
+    names = _gen_candidates(cfg)
+    if not include_used:
+        # used names would be dropped anyway: don't probe them
+        names = (name for name in names if name not in used)
+    # rows are only built for the `limit` hits returned; probing stops with them
+    hits = itertools.islice(_iter_existing(base, names, cfg["state_prefix"]), max(limit, 0))
+    rows = [{
+        "name": name,
+        "url": url,
+        "exists": True,
+        "used": name in used,
+        "is_force": (name == force_name)
+    } for name, url in hits]
+    # the scan is unbounded: move anything it found past a gap into the picks' first range
+    _note_scan_hit(cfg["state_prefix"], base, *(r["name"] for r in rows))
+    return rows
+
+def next_video(cfg) -> Tuple[Optional[str], Optional[IO[bytes]]]:
+    """Picks and downloads the next video; returns (url, open file) or (None, None)."""
+    used = _used_set(cfg["state_prefix"])
     base = cfg["video_base_url"].rstrip("/")
     # forced first
     force_name = get_force_next(cfg["state_prefix"])
     if force_name and force_name not in used:
-        base_name, ext = os.path.splitext(force_name)
-        try_names = [force_name] if ext else [base_name + e for e in _exts()]
-        for n in try_names:
-            url = f"{base}/{quote(n, safe='')}"
-            if _url_exists(url):
-                local_path = _download_to_tmp(url, os.path.splitext(n)[1] or ".mp4")
-                used.add(force_name)
-                save_used_list(cfg["state_prefix"], list(used))
-                set_force_next(cfg["state_prefix"], None)
-                return url, local_path
-    # auto-pick
-    for name in _gen_candidates(cfg):
-        if name in used: continue
-        base_name, ext = os.path.splitext(name)
-        try_names = [name] if ext else [base_name + e for e in _exts()]
-        for n in try_names:
-            url = f"{base}/{quote(n, safe='')}"
-            if _url_exists(url):
-                local_path = _download_to_tmp(url, os.path.splitext(n)[1] or ".mp4")
-                used.add(name)
-                save_used_list(cfg["state_prefix"], list(used))
-                return url, local_path
+        url = _find_video_url(base, force_name)
+        if url:
+            video = _download_to_spool(url)
+            mark_used(cfg["state_prefix"], force_name)
+            set_force_next(cfg["state_prefix"], None)
+            return url, video
+    probe_cache = _load_probe_cache(cfg["state_prefix"], base)
+    manifest_names = _candidate_names_from_manifest(cfg)
+    if manifest_names and str(cfg.get("trust_manifest", "true")).lower() != "false":
+        # the manifest already lists files that exist: download without probing first
+        hits = ((name, f"{base}/{_quoted(name)}") for name in manifest_names if name not in used)
+    else:
+        # auto-pick: first existing unused candidate, probed in concurrent batches
+        unused = (name for name in _gen_candidates(cfg, bounded=True) if name not in used)
+        hits = _iter_existing(base, unused, cfg["state_prefix"], probe_cache)
+    for name, url in hits:
+        try:
+            video = _download_to_spool(url)
+        except requests.HTTPError as e:
+            # a stale manifest line or cached hit can outlive the file (404/410, or
+            # 401/403 on a signed CDN): forget it, keep looking. 5xx still fails the run
+            if e.response is None or not 400 <= e.response.status_code < 500:
+                raise
+            _forget_probe(cfg["state_prefix"], base, name, probe_cache)
+            continue
+        mark_used(cfg["state_prefix"], name)
+        _note_scan_hit(cfg["state_prefix"], base, name)
+        return url, video
     return None, None
 
 # =========================
 # OAuth & credentials
 # =========================
-def _normalized_token_file(token_path, state_prefix="yt"):
-    token_path = (token_path or "").strip()
+@lru_cache(maxsize=64)
+def _resolve_token_file(token_path, state_prefix):
     if token_path.lower().replace("\\", "/").rstrip("/\\") in ("", "tokens"):
-        token_path = os.path.join("tokens", f"{state_prefix}.json")
+        return os.path.join("tokens", f"{state_prefix}.json")
     if os.path.isdir(token_path):
-        token_path = os.path.join(token_file, f"{state_prefix}.json")
-    parent = os.path.dirname(token_path) or "."
-    os.makedirs(parent, exist_ok=True)
+        return os.path.join(token_path, f"{state_prefix}.json")
+    return token_path
+
+def _normalized_token_file(token_path, state_prefix="yt"):
+    # called on every credential load: path resolution and makedirs are cached
+    token_path = _resolve_token_file((token_path or "").strip(), state_prefix)
+    _ensure_dir_once(os.path.dirname(token_path))
     return token_path
 
 def _write_token_file(token_path, credentials):
-    os.makedirs(os.path.dirname(token_path) or ".", exist_ok=True)
+    _ensure_dir_once(os.path.dirname(token_path))
     data = {
         "token": credentials.token,
         "refresh_token": credentials.refresh_token,
@@ -279,8 +827,7 @@ def _write_token_file(token_path, credentials):
         "scopes": list(credentials.scopes or []),
         "expiry": getattr(credentials, "expiry", None).isoformat() if getattr(credentials, "expiry", None) else None,
     }
-    with open(token_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    _write_json(token_path, data, mode=0o600)  # OAuth secrets: owner-only
 
 def get_auth_flow_for_account(acct, scopes, redirect_base) -> Flow:
     redirect_uri = redirect_base.rstrip("/") + "/oauth2callback"
@@ -288,36 +835,63 @@ def get_auth_flow_for_account(acct, scopes, redirect_base) -> Flow:
         acct["client_secrets_file"], scopes=scopes, redirect_uri=redirect_uri
     )
 
-def store_credentials_for_account(acct, credentials):
+def store_credentials_for_account(acct, credentials, accounts=None):
+    """
+    Writes the token file and merges `acct` into the accounts file (matched by
+    state_prefix). Pass `accounts` from an open with_accounts() block to merge
+    into that list instead of loading and saving separately.
+    """
     token_path = _normalized_token_file(acct.get("token_file"), acct.get("state_prefix", "yt"))
     _write_token_file(token_path, credentials)
     acct["token_file"] = token_path
+    _invalidate_channel_info(acct.get("state_prefix", ""))
 
-    accounts = load_accounts()
-    updated = False
+    if accounts is None:
+        with with_accounts() as accounts:
+            _merge_account(accounts, acct)
+    else:
+        _merge_account(accounts, acct)
+
+def _merge_account(accounts, acct):
+    # update in place, keeping account order
     for i, a in enumerate(accounts):
         if a.get("state_prefix") == acct.get("state_prefix"):
             accounts[i] = {**a, **acct}
-            updated = True
-            break
-    if not updated:
-        accounts.append(acct)
-    save_accounts(accounts)
+            return
+    accounts.append(acct)
+
+def _token_mtime(token_path):
+    try:
+        return os.stat(token_path).st_mtime_ns
+    except OSError:
+        return None
+
+# token file -> (mtime_ns, Credentials); the JSON is only reparsed when the file changes
+_creds_cache: Dict[str, Tuple[int, Credentials]] = {}
+_creds_cache_lock = threading.Lock()
 
 def _load_credentials(token_path) -> Optional[Credentials]:
     try:
         token_path = _normalized_token_file(token_path)
-        if not os.path.isfile(token_path): return None
-        with open(token_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if not isinstance(data, dict) or "client_id" not in data: return None
-        creds = Credentials.from_authorized_user_info(data)
+        mtime = _token_mtime(token_path)
+        if mtime is None: return None
+        with _creds_cache_lock:
+            hit = _creds_cache.get(token_path)
+        if hit and hit[0] == mtime:
+            creds = hit[1]
+        else:
+            data = _read_json(token_path)
+            if not isinstance(data, dict) or "client_id" not in data: return None
+            creds = Credentials.from_authorized_user_info(data)
         if creds and creds.expired and creds.refresh_token:
             try:
                 creds.refresh(GARequest())
                 _write_token_file(token_path, creds)
             except Exception:
                 pass
+        # re-stat: a refresh rewrites the token file (refreshed outside the lock)
+        with _creds_cache_lock:
+            _creds_cache[token_path] = (_token_mtime(token_path), creds)
         return creds
     except Exception:
         return None
@@ -330,8 +904,7 @@ REQUIRED_SCOPES = {
 
 def _read_client_id_from_secrets(client_secrets_file: str) -> str | None:
     try:
-        with open(client_secrets_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _read_json(client_secrets_file)
         container = data.get("installed") or data.get("web") or {}
         return container.get("client_id")
     except Exception:
@@ -348,15 +921,40 @@ def has_valid_credentials(acct):
         return False
     return True
 
+# built clients, cached per thread (the underlying httplib2 client is not
+# thread-safe) and keyed by token file + mtime so re-auth/refresh rebuilds
+_yt_local = threading.local()
+
 def _yt(acct):
+    token_path = _normalized_token_file(acct.get("token_file"))
+    services = getattr(_yt_local, "services", None)
+    if services is None:
+        services = _yt_local.services = {}
+    svc = services.get((token_path, _token_mtime(token_path)))
+    if svc is not None:
+        return svc
+
     creds = _load_credentials(acct.get("token_file"))
     if not creds:
         raise RuntimeError("No credentials for account; please click Authorize first.")
-    return build("youtube", "v3", credentials=creds, static_discovery=False)
+    # bundled discovery document: no HTTP fetch per build
+    svc = build("youtube", "v3", credentials=creds, static_discovery=True, cache_discovery=False)
+    for key in [k for k in services if k[0] == token_path]:
+        del services[key]
+    # re-stat: loading may have refreshed and rewritten the token
+    services[(token_path, _token_mtime(token_path))] = svc
+    return svc
 
 # =========================
 # Channel info (dashboard)
 # =========================
+_channel_cache = {}  # state_prefix -> (expires_at, info)
+_channel_cache_lock = threading.Lock()
+
+def _invalidate_channel_info(prefix):
+    with _channel_cache_lock:
+        _channel_cache.pop(prefix, None)
+
 def get_channel_title(acct):
     yt = _yt(acct)
     resp = yt.channels().list(part="snippet", mine=True).execute()
@@ -364,18 +962,27 @@ def get_channel_title(acct):
     return items[0]["snippet"]["title"] if items else None
 
 def get_channel_info(acct):
+    prefix = acct.get("state_prefix", "")
+    now = time.monotonic()
+    with _channel_cache_lock:
+        hit = _channel_cache.get(prefix)
+    if hit and hit[0] > now:
+        return hit[1]
+
     yt = _yt(acct)
     resp = yt.channels().list(part="snippet,contentDetails", mine=True).execute()
     items = resp.get("items", [])
-    if not items:
-        return None
-    it = items[0]
-    info = {
-        "id": it["id"],
-        "title": it["snippet"]["title"],
-        "custom_url": it["snippet"].get("customUrl"),
-        "uploads_playlist_id": it["contentDetails"]["relatedPlaylists"]["uploads"],
-    }
+    info = None
+    if items:
+        it = items[0]
+        info = {
+            "id": it["id"],
+            "title": it["snippet"]["title"],
+            "custom_url": it["snippet"].get("customUrl"),
+            "uploads_playlist_id": it["contentDetails"]["relatedPlaylists"]["uploads"],
+        }
+    with _channel_cache_lock:
+        _channel_cache[prefix] = (now + CHANNEL_INFO_TTL, info)
     return info
 
 def get_channel_url(info):
@@ -414,7 +1021,8 @@ def list_recent_uploads(acct, max_results=5):
 # =========================
 # Upload / Thumbnail
 # =========================
-def upload_video(local_path, meta, acct):
+def upload_video(video, meta, acct):
+    """`video` is a local file path or a seekable binary file object."""
     yt = _yt(acct)
     body = {
         "snippet": {
@@ -438,7 +1046,11 @@ def upload_video(local_path, meta, acct):
         if body["status"]["privacyStatus"] not in ("private", "unlisted"):
             body["status"]["privacyStatus"] = "private"
 
-    media = MediaFileUpload(local_path, chunksize=8 * 1024 * 1024, resumable=True, mimetype="video/*")
+    chunksize = max(1, int(acct.get("upload_chunksize_mb") or UPLOAD_CHUNK_MB)) * 1024 * 1024
+    if isinstance(video, str):
+        media = MediaFileUpload(video, chunksize=chunksize, resumable=True, mimetype="video/*")
+    else:
+        media = MediaIoBaseUpload(video, chunksize=chunksize, resumable=True, mimetype="video/*")
     request = yt.videos().insert(part="snippet,status", body=body, media_body=media)
 
     response = None
@@ -473,14 +1085,18 @@ def set_thumbnail(video_id, thumb_path, acct):
     except HttpError:
         return False
 
-def maybe_thumbnail(cfg) -> Tuple[Optional[str], Optional[str]]:
+def _pick_thumbnail(cfg) -> Tuple[Optional[str], Optional[str], Optional[int]]:
+    """
+    Downloads the next thumbnail without advancing the rotation.
+    Returns (url, local path, thumb_index to save once it has been used).
+    """
     one = (cfg.get("thumbnail_url") or "").strip()
     if one:
         try:
             path = _download_to_tmp(one, ".jpg")
-            return one, path
+            return one, path, None
         except Exception:
-            return None, None
+            return None, None, None
     tman = (cfg.get("thumb_manifest_url") or "").strip()
     if tman:
         try:
@@ -488,66 +1104,128 @@ def maybe_thumbnail(cfg) -> Tuple[Optional[str], Optional[str]]:
             idx = load_last_index(cfg["state_prefix"], "thumb_index")
             url = lines[idx % len(lines)]
             path = _download_to_tmp(url, ".jpg")
-            save_last_index(cfg["state_prefix"], "thumb_index", idx + 1)
-            return url, path
+            return url, path, idx + 1
         except Exception:
-            return None, None
+            return None, None, None
     base = (cfg.get("thumbnail_base_url") or "").strip()
-    if not base: return None, None
+    if not base: return None, None, None
     last = load_last_index(cfg["state_prefix"], "thumb_index")
     fn = f"thumb ({last + 1}).jpg"
     url = f"{base}/{quote(fn, safe='')}"
     try:
         path = _download_to_tmp(url, ".jpg")
-        save_last_index(cfg["state_prefix"], "thumb_index", last + 1)
-        return url, path
+        return url, path, last + 1
     except Exception:
-        return None, None
+        return None, None, None
+
+def maybe_thumbnail(cfg) -> Tuple[Optional[str], Optional[str]]:
+    url, path, next_idx = _pick_thumbnail(cfg)
+    if next_idx is not None:
+        save_last_index(cfg["state_prefix"], "thumb_index", next_idx)
+    return url, path
+
+def _discard_thumbnail(future):
+    path = future.result()[1]
+    if path:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
 
 # =========================
 # Single account runner (EXPORTED)
 # =========================
-def run_account(cfg):
+def run_account(cfg, job_id=None):
     """
     Picks a video (honors force-next), uploads it with title/desc/tags,
     optionally sets thumbnail, updates status, returns upload result dict.
+    `job_id` is carried through the status file so callers can track the run.
     """
     prefix = cfg["state_prefix"]
-    save_status(prefix, "running", "")
+    save_status(prefix, "running", "", job_id)
+    # the thumbnail and metadata files are independent of the video: overlap
+    # their downloads with it (indices are only claimed once a video is in hand)
+    thumb_future = _io_pool.submit(_pick_thumbnail, cfg)
+    meta_sources = _fetch_metadata_sources(cfg)
     try:
         # Pick + download video
-        _, local_video = next_video(cfg)
-        if not local_video:
+        _, video = next_video(cfg)
+        if not video:
             raise RuntimeError("No videos left / download failed")
 
-        # Compose metadata
-        meta = {
-            "title": next_title(cfg),
-            "description": next_description(cfg),
-            "tags": next_tags(cfg),
-            "privacy_status": cfg.get("privacy_status", "private"),
-            "category_id": cfg.get("category_id", "22"),
-            "default_language": cfg.get("default_language", ""),
-            "playlist_id": cfg.get("playlist_id", ""),
-            "schedule_publish_at": cfg.get("schedule_publish_at", ""),
-            "self_declared_mfk": cfg.get("self_declared_mfk", "false"),
-            "made_for_kids": cfg.get("made_for_kids", "false"),
-        }
+        with video:
+            # Compose metadata
+            title, description, tags = next_metadata(cfg, meta_sources)
+            meta = {
+                "title": title,
+                "description": description,
+                "tags": tags,
+                "privacy_status": cfg.get("privacy_status", "private"),
+                "category_id": cfg.get("category_id", "22"),
+                "default_language": cfg.get("default_language", ""),
+                "playlist_id": cfg.get("playlist_id", ""),
+                "schedule_publish_at": cfg.get("schedule_publish_at", ""),
+                "self_declared_mfk": cfg.get("self_declared_mfk", "false"),
+                "made_for_kids": cfg.get("made_for_kids", "false"),
+            }
 
-        # Upload
-        result = upload_video(local_video, meta, cfg)
+            # Upload
+            result = upload_video(video, meta, cfg)
 
-        # Try thumbnail sources
-        _, thumb_local = maybe_thumbnail(cfg)
+        # Thumbnail (prefetched); the rotation only advances once a video went up
+        try:
+            _, thumb_local, thumb_next = thumb_future.result(timeout=30)
+        except FutureTimeoutError:
+            thumb_local, thumb_next = None, None
         if thumb_local:
             try:
                 set_thumbnail(result["video_id"], thumb_local, cfg)
             except Exception:
                 pass
+        if thumb_next is not None:
+            save_last_index(prefix, "thumb_index", thumb_next)
 
-        save_status(prefix, "success", json.dumps(result))
+        _invalidate_channel_info(prefix)
+        save_status(prefix, "success", orjson.dumps(result).decode(), job_id)
         return result
 
     except Exception as e:
-        save_status(prefix, "error", str(e))
+        save_status(prefix, "error", str(e), job_id)
         return None
+    finally:
+        # runs now, or when a still-running prefetch finishes
+        thumb_future.add_done_callback(_discard_thumbnail)
+
+async def run_accounts_async(cfgs, concurrency=4):
+    """
+    Runs several accounts at once (each run is independent, I/O-bound work
+    on its own credentials), at most `concurrency` at a time.
+    Returns run_account results in the order of `cfgs`; None for a failed run,
+    a repeated state_prefix, or a prefix already running elsewhere (dashboard,
+    another script), which would otherwise pick and upload the same video.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(cfg, job_id):
+        async with sem:
+            return await asyncio.to_thread(run_account, cfg, job_id)
+
+    async def skipped():
+        return None
+
+    seen, runs = set(), []
+    for cfg in cfgs:
+        prefix = cfg["state_prefix"]
+        if prefix in seen or is_run_active(prefix):
+            runs.append(skipped())
+            continue
+        seen.add(prefix)
+        # mark queued up front, like the dashboard, so other runners see it
+        job_id = uuid.uuid4().hex
+        save_status(prefix, "queued", "", job_id)
+        runs.append(one(cfg, job_id))
+    return await asyncio.gather(*runs)
+
+def run_accounts(cfgs, concurrency=4):
+    """Blocking wrapper around run_accounts_async, e.g. for a cron script."""
+    return asyncio.run(run_accounts_async(cfgs, concurrency))